@@ -2,12 +2,15 @@
     Snake game using curses for graphics and input
 """
 
+import bisect
 import curses
 import enum
+import math
 import random
 import time
-from typing import List, Tuple, Dict
-from dataclasses import dataclass
+from collections import deque
+from functools import lru_cache
+from typing import List, Tuple, Dict, Optional, Set, Deque, Union
 
 
 # +----------------------------------------------------+
@@ -19,8 +22,13 @@ FPS = 30
 GAME_WIDTH = 15
 GAME_HEIGHT = 10
 MAX_SCORE = GAME_WIDTH * GAME_HEIGHT - 1
+ALL_CELLS = [(x, y) for x in range(GAME_WIDTH) for y in range(GAME_HEIGHT)]
 SNAKE_MOVE_DELAY = 5
+MAX_QUEUED_INPUTS = 4
 BORDER_CHARS = ("|", "|", "-", "-", "+", "+", "+", "+")
+SQUARE = "  "
+QUIT_KEY = ord("q")
+RETRY_KEY = ord("r")
 MESSAGES = [
     "NICE TRY!",
     "GOOD JOB!",
@@ -35,12 +43,12 @@ MESSAGES = [
 # +----------------------------------------------------+
 
 
-class Direction(enum.IntEnum):
+class Direction:
     """
-        Enum for the directions the snake can travel
+        The directions the snake can travel. These are plain ints rather
+        than an enum, as they are compared on every move
     """
 
-    # opposite inputs add to 3
     UP = 0
     RIGHT = 1
     LEFT = 2
@@ -48,6 +56,32 @@ class Direction(enum.IntEnum):
     NONE = -1
 
 
+# the direction the snake moves in for each arrow key
+KEY_DIRECTIONS: Dict[int, int] = {
+    curses.KEY_UP: Direction.UP,
+    curses.KEY_DOWN: Direction.DOWN,
+    curses.KEY_LEFT: Direction.LEFT,
+    curses.KEY_RIGHT: Direction.RIGHT
+}
+
+# the (x, y) change in position for each direction
+DIRECTION_DELTAS: Dict[int, Tuple[int, int]] = {
+    Direction.UP: (0, -1),
+    Direction.RIGHT: (1, 0),
+    Direction.LEFT: (-1, 0),
+    Direction.DOWN: (0, 1),
+    Direction.NONE: (0, 0)
+}
+
+# the direction that would turn the snake back on itself
+OPPOSITE_DIRECTIONS: Dict[int, int] = {
+    Direction.UP: Direction.DOWN,
+    Direction.DOWN: Direction.UP,
+    Direction.LEFT: Direction.RIGHT,
+    Direction.RIGHT: Direction.LEFT
+}
+
+
 class Colors(enum.IntEnum):
     """
         Enum for color indices to be used when drawing
@@ -56,41 +90,55 @@ class Colors(enum.IntEnum):
     TEXT = 1
     SNAKE = 2
     APPLE = 3
+    BACKGROUND = 4
+
+
+# the curses attribute for each color, filled in once the color pairs
+# have been initialized in `main`
+COLOR_ATTRS: Dict[Colors, int] = {}
 
 
-@dataclass
-class Point:
+class CellSet:
     """
-        A 2D position in the game
+        A set of (x, y) cells that a random cell can be picked from in
+        constant time. The cells are kept in a list, along with the
+        index of each cell in that list
     """
-    x: int
-    y: int
 
-    def copy(self) -> "Point":
+    def __init__(self, cells: List[Tuple[int, int]]):
+        self.cells = list(cells)
+        self.indices = {cell: i for (i, cell) in enumerate(self.cells)}
+
+    def add(self, cell: Tuple[int, int]):
         """
-            Returns a shallow copy of this point
+            Add `cell` to the set if it isn't already in it
         """
 
-        return Point(self.x, self.y)
-
+        if cell not in self.indices:
+            self.indices[cell] = len(self.cells)
+            self.cells.append(cell)
 
-class Segment:
-    """
-        A segment of the snake's body
-    """
+    def discard(self, cell: Tuple[int, int]):
+        """
+            Remove `cell` from the set if it is in it, by moving the last
+            cell in the list into its place
+        """
 
-    def __init__(self, pos: Point):
-        self.pos = pos
+        i = self.indices.pop(cell, None)
+        if i is None:
+            return
 
-    def __eq__(self, other):
-        return self.pos == other.pos
+        last = self.cells.pop()
+        if i < len(self.cells):
+            self.cells[i] = last
+            self.indices[last] = i
 
-    def draw(self, window):
+    def choice(self) -> Tuple[int, int]:
         """
-            Draw the segment to the screen
+            Returns a random cell from the set
         """
 
-        window.draw_square(self.pos, Colors.SNAKE)
+        return random.choice(self.cells)
 
 
 # +----------------------------------------------------+
@@ -115,48 +163,51 @@ class Window:
         self.win = screen.subwin(height, width, y, x)
         self.has_border = has_border
 
-    def clear(self):
-        """
-            Clear the window, redrawing its border if it has one
-        """
+        # the size (w, h) of the window
+        self.size = (width, height)
 
-        self.win.erase()
+        # the border never changes, so it is only drawn once. the inside
+        # of the window gets a subwindow of its own, so that it can be
+        # erased without touching the border
+        self.inside = self.win
         if self.has_border:
             self.win.border(*BORDER_CHARS)
+            self.inside = self.win.derwin(height - 2, width - 2, 1, 1)
+
+            # changes made through `inside` need to be seen by `win`,
+            # which is the one that gets refreshed
+            self.inside.syncok(True)
 
-    def refresh(self):
+    def clear(self):
         """
-            Refresh the window
+            Clear the window, leaving its border in place if it has one
         """
 
-        self.win.refresh()
+        self.inside.erase()
 
-    def write(self, pos: Tuple[int, int], text: str):
+    def noutrefresh(self):
         """
-            Write `text` in the window at position `pos`
+            Mark the window to be copied to the screen on the next
+            `curses.doupdate`
         """
 
-        self.win.attron(curses.color_pair(Colors.TEXT))
-        self.win.addstr(*pos, text)
-        self.win.attroff(curses.color_pair(Colors.TEXT))
+        self.win.noutrefresh()
 
-    def draw_square(self, pos: Point, color: Colors):
+    def write(self, pos: Tuple[int, int], text: str):
         """
-            Draw a square in `window` at `pos` with `color`
+            Write `text` in the window at position `pos`
         """
 
-        self.win.attron(curses.color_pair(color))
-        self.win.addstr(pos.y + 1, pos.x * 2 + 1, "  ")
-        self.win.attroff(curses.color_pair(color))
+        self.win.addstr(*pos, text, COLOR_ATTRS[Colors.TEXT])
 
-    @property
-    def size(self) -> Tuple[int, int]:
+    def draw_square(self, pos: Tuple[int, int], color: Colors):
         """
-            The size (w, h) of the window
+            Draw a square in `window` at the (x, y) position `pos`
+            with `color`
         """
 
-        y, x = self.win.getmaxyx()
-        return (x, y)
+        (x, y) = pos
+        self.win.addstr(y + 1, x * 2 + 1, SQUARE, COLOR_ATTRS[color])
 
 
 class GameWindow(Window):
@@ -174,17 +225,86 @@ class GameWindow(Window):
 
         super().__init__(screen, height, width, y, x)
 
+        # the whole window is only redrawn when this is set, otherwise
+        # only the cells that changed since the last frame are drawn
+        self.needs_redraw = True
+
+        # the color of every square in the game, and the range of
+        # columns in each row that changed since they were last written
+        self.squares = [
+            [Colors.BACKGROUND] * GAME_WIDTH for _ in range(GAME_HEIGHT)
+        ]
+        self.changed_spans: Dict[int, Tuple[int, int]] = {}
+
+    def clear(self):
+        """
+            Clear every square in the game
+        """
+
+        for (y, row) in enumerate(self.squares):
+            row[:] = [Colors.BACKGROUND] * GAME_WIDTH
+            self.changed_spans[y] = (0, GAME_WIDTH - 1)
+
+    def draw_square(self, pos: Tuple[int, int], color: Colors):
+        """
+            Set the square at the (x, y) position `pos` to `color`.
+            The square is written to the window by `flush`
+        """
+
+        (x, y) = pos
+        if self.squares[y][x] == color:
+            return
+
+        self.squares[y][x] = color
+
+        span = self.changed_spans.get(y)
+        if span is None:
+            self.changed_spans[y] = (x, x)
+        else:
+            self.changed_spans[y] = (min(span[0], x), max(span[1], x))
+
+    def flush(self):
+        """
+            Write the squares that changed to the window, using a single
+            `addstr` for each run of squares with the same color in a row
+        """
+
+        for (y, (start, end)) in self.changed_spans.items():
+            row = self.squares[y]
+            run_start = start
+
+            for x in range(start + 1, end + 2):
+                if x <= end and row[x] == row[run_start]:
+                    continue
+
+                self.win.addstr(
+                    y + 1,
+                    run_start * 2 + 1,
+                    SQUARE * (x - run_start),
+                    COLOR_ATTRS[row[run_start]]
+                )
+                run_start = x
+
+        self.changed_spans.clear()
+
     def draw(self, snake: "Snake", apple: "Apple"):
         """
             Draw the game window (the snake and the apple)
         """
 
-        self.clear()
+        if self.needs_redraw:
+            self.clear()
+
+            snake.draw(self)
+            apple.draw(self)
 
-        snake.draw(self)
-        apple.draw(self)
+            self.needs_redraw = False
+        else:
+            snake.draw_changes(self)
+            apple.draw_changes(self)
 
-        self.refresh()
+        self.flush()
+        self.noutrefresh()
 
 
 class ScoreWindow(Window):
@@ -202,6 +322,12 @@ class ScoreWindow(Window):
 
         super().__init__(screen, height, width, y, x)
 
+        (x, _y) = self.size
+        self.center = x // 2
+
+        # the word "SCORE" never changes, so it is only formatted once
+        self.label = format_centered("SCORE", self.center - 1)
+
     def draw(self, score: int):
         """
             Write the player's score in the score subwindow
@@ -212,21 +338,20 @@ class ScoreWindow(Window):
             +--------------------+
         """
 
-        self.clear()
-
-        (x, _y) = self.size
-        center = x // 2
+        # the row is filled from border to border, so the window doesn't
+        # need clearing first
 
         # write the word "SCORE" in the left half, center aligned
-        self.write((1, 1), f"{'SCORE': ^{center - 1}}")
+        self.write((1, 1), self.label)
 
         # write a pipe character in the middle as a separator
-        self.write((1, center), "|")
+        self.write((1, self.center), "|")
 
         # write the score in the right half, center aligned
-        self.write((1, center + 1), f"{score: ^{center - 2}}")
+        score_text = format_centered(score, self.center - 2)
+        self.write((1, self.center + 1), score_text)
 
-        self.refresh()
+        self.noutrefresh()
 
 
 class HighScoreWindow(Window):
@@ -244,28 +369,37 @@ class HighScoreWindow(Window):
 
         super().__init__(screen, height, width, y, x)
 
+        # the scores that are currently drawn
+        self.drawn_scores: Optional[Tuple[int, ...]] = None
+
     def draw(self, scores: List[int]):
         """
             Write the player's high scores in the high score window
-            to the right of the game window
+            to the right of the game window.
+            `scores` must be sorted from lowest to highest
         """
 
+        # nothing to do if the scores haven't changed since last time
+        if tuple(scores) == self.drawn_scores:
+            return
+
+        self.drawn_scores = tuple(scores)
+
         self.clear()
 
         (x, y) = self.size
 
         # write the word "HISCORE" at the top, center aligned
-        self.write((1, 2), f"{'HISCORE': ^{x - 3}}")
+        self.write((1, 2), format_centered("HISCORE", x - 3))
 
         # write a separator below the window title
         self.write((2, 0), "+----+------+")
 
-        high_scores = sorted(scores, reverse=True)
-
-        # iterate over as many high scores as will fit in the window
+        # iterate over as many high scores as will fit in the window,
+        # starting from the end of `scores` where the highest ones are
         for i in range(y - 4):
-            if i < len(high_scores):
-                score = high_scores[i]
+            if i < len(scores):
+                score = scores[-1 - i]
                 rank = i + 1
             else:
                 score = ""
@@ -274,9 +408,9 @@ class HighScoreWindow(Window):
             row = i + 3
 
             # write the rank and score in the corresponding row
-            self.write((row, 1), f" {rank: >2} | {score: >4} ")
+            self.write((row, 1), format_high_score(rank, score))
 
-        self.refresh()
+        self.noutrefresh()
 
 
 class MessageWindow(Window):
@@ -294,22 +428,34 @@ class MessageWindow(Window):
 
         super().__init__(screen, height, width, y, x, has_border=False)
 
+        # the finish message that is currently drawn
+        self.drawn_message: Optional[str] = None
+
     def draw(self, is_dead: bool, score: int):
         """
             Write the finish message and the controls to the window
         """
 
+        message = ""
+        if is_dead:
+            message = f"{get_finish_message(score)} R = RETRY"
+
+        # nothing to do if the message hasn't changed since last time
+        if message == self.drawn_message:
+            return
+
+        self.drawn_message = message
+
         self.clear()
 
         (x, _y) = self.size
 
-        if is_dead:
-            message = get_finish_message(score)
-            self.write((0, 0), f"{message} R = RETRY")
+        if message:
+            self.write((0, 0), message)
 
         self.write((0, x - 9), "Q = QUIT")
 
-        self.refresh()
+        self.noutrefresh()
 
 
 # +----------------------------------------------------+
@@ -343,87 +489,146 @@ class Game:
         # the player's current score this game
         self.score = 0
 
-        # all of the player's scores since they started playing
+        # set whenever `score` changes so the score window is redrawn
+        self.score_dirty = True
+
+        # all of the player's scores since they started playing, kept
+        # sorted from lowest to highest
         self.scores: List[int] = []
 
-        # a queue of inputs to be applied to the snake
-        self.inputs: List[Direction] = []
+        # a queue of inputs to be applied to the snake. once it is full,
+        # adding an input drops the oldest one
+        self.inputs: Deque[int] = deque(maxlen=MAX_QUEUED_INPUTS)
+
+        # the number of frames left until the snake moves next
+        self.frames_until_move = SNAKE_MOVE_DELAY
+
+        # set whenever anything on screen changes, nothing is drawn
+        # otherwise
+        self.dirty = True
 
     def handle_input(self) -> bool:
         """
-            Handle the player's input, adding a direction to the
-            input queue if necessary.
+            Handle all of the player's pending input, adding directions
+            to the input queue if necessary.
             Returns False if the player quits the game.
         """
 
         k = self.screen.getch()
 
-        # if the player presses q, close the game
-        if k == ord("q"):
-            return False
-
-        if k == ord("r") and self.snake.is_dead():
-            self.snake.reset()
-            self.apple.set_new_pos(self.snake)
-            self.score = 0
-            self.inputs = []
-
-        # add the player input direction to the input queue
-        if k == curses.KEY_UP:
-            self.inputs.append(Direction.UP)
-        elif k == curses.KEY_DOWN:
-            self.inputs.append(Direction.DOWN)
-        elif k == curses.KEY_LEFT:
-            self.inputs.append(Direction.LEFT)
-        elif k == curses.KEY_RIGHT:
-            self.inputs.append(Direction.RIGHT)
+        # read every key that is waiting, so that a burst of key presses
+        # is handled in a single frame
+        while k != -1:
+            # if the player presses q, close the game
+            if k == QUIT_KEY:
+                return False
+
+            # repaint the whole terminal once the window has been resized
+            if k == curses.KEY_RESIZE:
+                self.screen.clearok(True)
+                self.screen.noutrefresh()
+                self.dirty = True
+
+            if k == RETRY_KEY and self.snake.is_dead():
+                self.snake.reset()
+                self.apple.set_new_pos(self.snake)
+                self.score = 0
+                self.score_dirty = True
+                self.inputs.clear()
+                self.frames_until_move = SNAKE_MOVE_DELAY
+                self.windows["game"].needs_redraw = True
+                self.dirty = True
+
+            # add the player input direction to the input queue, unless
+            # it wouldn't change the direction the snake is heading in
+            # by then, or would turn the snake back on itself
+            direction = KEY_DIRECTIONS.get(k)
+            if direction is not None:
+                if self.inputs:
+                    heading = self.inputs[-1]
+                else:
+                    heading = self.snake.prev_input
+
+                if (direction != heading
+                        and direction != OPPOSITE_DIRECTIONS.get(heading)):
+                    self.inputs.append(direction)
+
+            # the rest of the pending input is read without waiting
+            self.screen.timeout(0)
+            k = self.screen.getch()
 
         return True
 
     def draw(self):
         """
             Update the game's graphics.
-            Calls each window's `draw` method
+            Calls each window's `draw` method, then writes all of the
+            changes to the terminal at once
         """
 
-        self.screen.erase()
+        if not self.dirty:
+            return
 
         self.windows["game"].draw(self.snake, self.apple)
-        self.windows["score"].draw(self.score)
+
+        if self.score_dirty:
+            self.windows["score"].draw(self.score)
+            self.score_dirty = False
+
         self.windows["hiscore"].draw(self.scores)
         self.windows["message"].draw(self.snake.is_dead(), self.score)
 
-        self.screen.refresh()
+        curses.doupdate()
+
+        self.dirty = False
 
     def update(self):
         """
             Update the game's state
         """
 
-        # update the snake
-        self.snake.update(self.inputs)
+        # the snake waits `SNAKE_MOVE_DELAY` frames between each move,
+        # and nothing else can change in the meantime
+        if self.frames_until_move > 0:
+            self.frames_until_move -= 1
+            return
+
+        self.frames_until_move = SNAKE_MOVE_DELAY
+
+        if self.snake.is_dead():
+            return
+
+        # move the snake
+        prev_head = self.snake.head
+        self.snake.step(self.inputs)
 
         # if the snake's head coincides with the apple, it eats it
-        if not self.snake.is_dead() and self.snake.head.pos == self.apple.pos:
+        if not self.snake.is_dead() and self.snake.head == self.apple.pos:
             # move the apple to a new position
             self.apple.set_new_pos(self.snake)
 
             # increase the snake's length by one segment
-            self.snake.add_segment(self.snake.head)
+            self.snake.grow()
             self.score += 1
+            self.score_dirty = True
 
-        # the program would hang forever if the player collected
-        # `MAX_SCORE` apples, specifically in the `while` loop in
-        # `Apple.set_new_pos`, as every possible position would overlap
-        # with the snake. thus we need to manually set the snake to
-        # dead so that the player can actually win.
+        # the program would crash if the player collected `MAX_SCORE`
+        # apples, specifically in `Apple.set_new_pos`, as every
+        # possible position would overlap with the snake. thus we need
+        # to manually set the snake to dead so that the player can
+        # actually win.
         if self.score == MAX_SCORE:
             self.snake.change_state(self.snake.State.DEAD)
 
         # if the snake has just died, add the current score
         # to the player's `scores` list
-        if self.snake.is_dead() and self.snake.counter == 1:
-            self.scores.append(self.score)
+        if self.snake.is_dead():
+            bisect.insort(self.scores, self.score)
+
+        # the screen only needs redrawing if something changed. the
+        # snake stays still until the player's first input
+        if self.snake.head != prev_head or self.snake.is_dead():
+            self.dirty = True
 
 
 class Snake:
@@ -434,138 +639,160 @@ class Snake:
     class State(enum.IntEnum):
         """
             The snake's current state
-            WAIT: The snake is waiting to move
             MOVE: The snake is moving based on the player input
             DEAD: The snake is dead after hitting itself/a wall
         """
 
-        WAIT = 0
-        MOVE = 1
-        DEAD = 2
+        MOVE = 0
+        DEAD = 1
 
     def __init__(self):
-        self.head = Segment(Point(GAME_WIDTH // 2, GAME_HEIGHT // 2))
-        self.body_segments: List[Segment] = [self.head]
-        self.state: self.State = self.State.WAIT
-        self.counter = 0
+        start = (GAME_WIDTH // 2, GAME_HEIGHT // 2)
+
+        # the (x, y) position of each segment of the body, head first.
+        # the snake can never be longer than the number of cells
+        self.body: Deque[Tuple[int, int]] = deque(
+            [start], maxlen=len(ALL_CELLS)
+        )
+        self.state: self.State = self.State.MOVE
+
+        # the positions covered by the body and the positions that are
+        # free, kept in sync with `body` so that overlap checks and
+        # placing the apple don't scan the body
+        self.occupied: Set[Tuple[int, int]] = {start}
+        self.free_cells = CellSet(ALL_CELLS)
+        self.free_cells.discard(start)
+
+        # the number of segments still to be added as the snake moves
+        self.growth = 0
 
         # leave the snake stationary at the start
-        self.prev_input: Direction = Direction.NONE
-        self.cur_input: Direction = Direction.NONE
+        self.prev_input = Direction.NONE
+        self.cur_input = Direction.NONE
+
+        # the head and tail positions before the last move, used to
+        # only redraw the cells that changed
+        self.prev_head_pos: Optional[Tuple[int, int]] = None
+        self.prev_tail_pos: Optional[Tuple[int, int]] = None
 
     def reset(self):
         """
             Reset the snake's state, position and body
         """
 
-        self.head.pos = Point(GAME_WIDTH // 2, GAME_HEIGHT // 2)
-        self.body_segments: List[Segment] = [self.head]
+        start = (GAME_WIDTH // 2, GAME_HEIGHT // 2)
+        self.body = deque([start], maxlen=len(ALL_CELLS))
+        self.occupied = {start}
+        self.free_cells = CellSet(ALL_CELLS)
+        self.free_cells.discard(start)
+        self.growth = 0
         self.prev_input = Direction.NONE
         self.cur_input = Direction.NONE
+        self.prev_head_pos = None
+        self.prev_tail_pos = None
 
-        self.change_state(self.State.WAIT)
+        self.change_state(self.State.MOVE)
 
     def change_state(self, state: State):
         """
-            Change the snake's state and reset the frame counter
+            Change the snake's state
         """
 
         self.state = state
-        self.counter = 0
 
-    def update_wait(self):
+    def step(self, inputs: Deque[int]):
         """
-            Update the snake when it's in the WAIT state.
-            Waits for `SNAKE_MOVE_DELAY` frames and then enters the MOVE state
-        """
-
-        if self.counter == SNAKE_MOVE_DELAY:
-            self.change_state(self.State.MOVE)
-
-    def update_move(self, inputs: List[Direction]):
-        """
-            Update the snake when it's in the MOVE state.
-            Moves based on the player's input.
+            Move the snake once, based on the player's input.
             Enters the DEAD state if this move made the snake die.
-            Enters the WAIT state otherwise.
         """
 
+        prev_input = self.prev_input
+
         # if the player didn't input anything, continue moving in the
         # same direction
-        self.cur_input = None
         if len(inputs) == 0:
-            self.cur_input = self.prev_input
+            cur_input = prev_input
         else:
-            self.cur_input = inputs.pop(0)
+            cur_input = inputs.popleft()
 
-        # don't change direction if the snake would turn back on itself
-        if self.cur_input + self.prev_input == 3:
-            self.cur_input = self.prev_input
+        # don't change direction if the snake would turn back on itself.
+        # inputs are checked when queued, but the oldest ones are dropped
+        # once the queue is full, so this can still happen
+        if cur_input == OPPOSITE_DIRECTIONS.get(prev_input):
+            cur_input = prev_input
 
         # apply the movement direction to the snake
-        is_dead = self.move(self.cur_input)
-        self.prev_input = self.cur_input
+        is_dead = self.move(cur_input)
+        self.cur_input = cur_input
+        self.prev_input = cur_input
 
         if is_dead:
             self.change_state(self.State.DEAD)
-        else:
-            self.change_state(self.State.WAIT)
 
-    def update(self, inputs):
+    @property
+    def head(self) -> Tuple[int, int]:
         """
-            Update the snake once per frame.
-            Increment the `counter` attribute.
-            Calls the `update_*` method corresponding to the snake's state.
+            The (x, y) position of the snake's head
         """
 
-        self.counter += 1
-
-        if self.state == self.State.WAIT:
-            self.update_wait()
-
-        elif self.state == self.State.MOVE:
-            self.update_move(inputs)
+        return self.body[0]
 
-        elif self.state == self.State.DEAD:
-            pass
-
-    def move(self, direction: Direction) -> bool:
+    def move(self, direction: int) -> bool:
         """
             Move the snake's head in a direction, and have its body follow it.
             Returns True if the snake dies, otherwise returns False
         """
 
-        prev_head = self.head.pos.copy()
+        # this runs every move, so the attributes used more than once
+        # are looked up only once
+        body = self.body
+        occupied = self.occupied
+        free_cells = self.free_cells
+        prev_head = body[0]
+        (x, y) = prev_head
 
         # move head based on direction passed in
-        if direction == Direction.UP:
-            self.head.pos.y -= 1
-        elif direction == Direction.DOWN:
-            self.head.pos.y += 1
-        elif direction == Direction.LEFT:
-            self.head.pos.x -= 1
-        elif direction == Direction.RIGHT:
-            self.head.pos.x += 1
-
-        # clamp snake position to stay within the game window
-        self.head.pos.x = clamp(self.head.pos.x, 0, GAME_WIDTH - 1)
-        self.head.pos.y = clamp(self.head.pos.y, 0, GAME_HEIGHT - 1)
-
-        # the snake dies if it hits a wall (if the above clamps succeed)
-        if self.head.pos == prev_head and direction != Direction.NONE:
+        (dx, dy) = DIRECTION_DELTAS[direction]
+        x += dx
+        y += dy
+
+        # the snake dies if it hits a wall
+        if not (0 <= x < GAME_WIDTH and 0 <= y < GAME_HEIGHT):
             return True
 
-        # the snake dies if it crashes into itself
-        if self.head in self.body_segments[1:-1]:
+        head = (x, y)
+
+        # the tail moves out of the way unless the snake is growing
+        tail = None
+        if self.growth > 0:
+            self.growth -= 1
+        else:
+            tail = body[-1]
+
+        # remember what changed so that only those cells get redrawn
+        self.prev_head_pos = prev_head
+        self.prev_tail_pos = tail
+
+        # the snake dies if it crashes into itself. the tail is about to
+        # move out of the way, so running into it is allowed
+        if head in occupied and head != tail:
+            # the head still moves into the body, leaving its cell empty
+            body[0] = head
+            occupied.discard(prev_head)
+            free_cells.add(prev_head)
+            self.prev_tail_pos = prev_head
             return True
 
-        # body follows after head by moving the last segment to the head's
-        # position on the previous frame
-        if len(self.body_segments) > 1:
-            tail = self.body_segments.pop()
-            tail.pos.x = prev_head.x
-            tail.pos.y = prev_head.y
-            self.body_segments.insert(1, tail)
+        # body follows after head by dropping the last segment and
+        # adding a new one where the head moved to
+        if tail is not None:
+            body.pop()
+            occupied.discard(tail)
+            free_cells.add(tail)
+
+        body.appendleft(head)
+        occupied.add(head)
+        free_cells.discard(head)
 
         return False
 
@@ -574,28 +801,42 @@ class Snake:
             Draw the snake to the game window
         """
 
-        self.head.draw(window)
-        for segment in self.body_segments:
-            segment.draw(window)
+        for pos in self.body:
+            window.draw_square(pos, Colors.SNAKE)
+
+        self.prev_head_pos = None
+        self.prev_tail_pos = None
 
-    def add_segment(self, segment: Segment):
+    def draw_changes(self, window):
         """
-            Add a segment to the snake's body
+            Draw only the cells that changed since the snake last moved:
+            clear the cell the tail left behind and draw the new head
         """
 
-        pos = segment.pos.copy()
-        self.body_segments.append(Segment(pos))
+        # the head may have moved into the cell the tail left behind
+        if (self.prev_tail_pos is not None
+                and not self.check_overlap(self.prev_tail_pos)):
+            window.draw_square(self.prev_tail_pos, Colors.BACKGROUND)
+
+        if self.prev_head_pos is not None:
+            window.draw_square(self.head, Colors.SNAKE)
+
+        self.prev_head_pos = None
+        self.prev_tail_pos = None
 
-    def check_overlap(self, pos: Point) -> bool:
+    def grow(self):
         """
-            Check if a point `pos` overlaps with the snake's body
+            Add a segment to the snake's body the next time it moves
         """
 
-        for segment in self.body_segments:
-            if segment.pos == pos:
-                return True
+        self.growth += 1
 
-        return False
+    def check_overlap(self, pos: Tuple[int, int]) -> bool:
+        """
+            Check if a point `pos` overlaps with the snake's body
+        """
+
+        return pos in self.occupied
 
     def is_dead(self) -> bool:
         """
@@ -611,6 +852,9 @@ class Apple:
     """
 
     def __init__(self, snake: Snake):
+        # set whenever the apple moves so it is redrawn
+        self.is_dirty = True
+
         self.set_new_pos(snake)
 
     def set_new_pos(self, snake: Snake):
@@ -618,17 +862,9 @@ class Apple:
             Place the apple in a new random position that doesn't
             overlap with the snake
         """
-        self.pos = Point(
-            random.randrange(0, GAME_WIDTH),
-            random.randrange(0, GAME_HEIGHT)
-        )
 
-        # ensure the apple doesn't overlap the snake
-        while snake.check_overlap(self.pos):
-            self.pos = Point(
-                random.randrange(0, GAME_WIDTH),
-                random.randrange(0, GAME_HEIGHT)
-            )
+        self.pos = snake.free_cells.choice()
+        self.is_dirty = True
 
     def draw(self, window):
         """
@@ -636,6 +872,15 @@ class Apple:
         """
 
         window.draw_square(self.pos, Colors.APPLE)
+        self.is_dirty = False
+
+    def draw_changes(self, window):
+        """
+            Draw the apple to the game window only if it has moved
+        """
+
+        if self.is_dirty:
+            self.draw(window)
 
 
 # +----------------------------------------------------+
@@ -643,18 +888,24 @@ class Apple:
 # +----------------------------------------------------+
 
 
-def clamp(num: int, lower: int, upper: int) -> int:
+@lru_cache(maxsize=64)
+def format_centered(value: Union[int, str], width: int) -> str:
     """
-        Returns `num` clamped between `lower` and `upper`
+        Returns `value` as a string, center aligned within `width`
+        characters
     """
 
-    if num > upper:
-        return upper
+    return f"{value: ^{width}}"
+
 
-    if num < lower:
-        return lower
+@lru_cache(maxsize=64)
+def format_high_score(rank: Union[int, str], score: Union[int, str]) -> str:
+    """
+        Returns a row of the high score table, with `rank` and `score`
+        right aligned in their columns
+    """
 
-    return num
+    return f" {rank: >2} | {score: >4} "
 
 
 def get_finish_message(score) -> str:
@@ -688,10 +939,11 @@ def main(screen):
 
     # initialize the screen
     screen.erase()
-    screen.refresh()
+    screen.noutrefresh()
+    curses.doupdate()
 
-    # make `getch` non-blocking
-    screen.nodelay(1)
+    # make `getch` wait at most one frame for input
+    screen.timeout(1000 // FPS)
 
     # try to turn off the cursor
     try:
@@ -704,27 +956,50 @@ def main(screen):
     curses.init_pair(Colors.TEXT, curses.COLOR_WHITE, curses.COLOR_BLACK)
     curses.init_pair(Colors.SNAKE, curses.COLOR_GREEN, curses.COLOR_GREEN)
     curses.init_pair(Colors.APPLE, curses.COLOR_RED, curses.COLOR_RED)
+    curses.init_pair(
+        Colors.BACKGROUND, curses.COLOR_BLACK, curses.COLOR_BLACK
+    )
+
+    for color in Colors:
+        COLOR_ATTRS[color] = curses.color_pair(color)
 
     game = Game(screen)
 
     try:
         # main game loop
         running = True
+
+        # each frame is due at a fixed time after `start`, so small
+        # delays don't add up over time
+        start = time.perf_counter()
+        frame_count = 0
+
         while running:
-            frame_start = time.time()
+            next_frame = start + (frame_count + 1) / FPS
 
-            # read the player input
+            # read the player input, waiting until the next frame is due.
+            # `getch` returns as soon as a key is pressed. the wait is
+            # rounded up so the loop doesn't spin for the last millisecond
+            remaining = next_frame - time.perf_counter()
+            screen.timeout(max(0, math.ceil(remaining * 1000)))
             running = game.handle_input()
 
+            # keep reading input if a key arrived before the frame is due
+            now = time.perf_counter()
+            if now < next_frame:
+                continue
+
+            # limit framerate to `FPS`. if the game has fallen more than a
+            # frame behind (e.g. it was suspended), start counting again
+            # rather than rushing through the missed frames
+            frame_count += 1
+            if now - next_frame > 1 / FPS:
+                start = now
+                frame_count = 0
+
             game.update()
             game.draw()
 
-            # limit framerate to `FPS`
-            frame_end = time.time()
-            frame_delta = frame_end - frame_start
-            if frame_delta < 1 / FPS:
-                time.sleep(1 / FPS - frame_delta)
-
     finally:
         # turn the cursor back on after the game ends
         if supports_invisible_cursor: